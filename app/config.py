@@ -24,6 +24,12 @@ class Settings(BaseSettings):
     video_output_dir: str = os.getenv("VIDEO_OUTPUT_DIR", "/app/videos")
     whisper_model_cache_dir: str = os.getenv("WHISPER_MODEL_CACHE_DIR", "/data/whisper-models")
 
+    # FFmpeg
+    video_encoder: str = os.getenv("VIDEO_ENCODER", "auto")
+    ffmpeg_max_processes: int = int(os.getenv("FFMPEG_MAX_PROCESSES", "0"))  # 0 = CPU count
+    media_cache_dir: str = os.getenv("MEDIA_CACHE_DIR", "/data/media-cache")
+    media_cache_ttl_hours: int = int(os.getenv("MEDIA_CACHE_TTL_HOURS", "24"))
+
     # Computed properties
     @property
     def max_file_size_bytes(self) -> int:
@@ -45,6 +51,7 @@ class Settings(BaseSettings):
         try:
             os.makedirs(self.video_output_dir, exist_ok=True)
             os.makedirs(self.whisper_model_cache_dir, exist_ok=True)
+            os.makedirs(self.media_cache_dir, exist_ok=True)
         except Exception as e:
             import logging
             logging.warning(f"Could not create directories: {e}")
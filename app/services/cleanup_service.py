@@ -110,33 +110,73 @@ class CleanupService:
             deleted_count = 0
 
             for item in os.listdir(temp_dir):
-                if item.startswith(("merge_", "music_", "ffmpeg_compose_")):
+                if item.startswith(("merge_", "music_", "ffmpeg_compose_", "broll_splice_", "srt_")):
                     item_path = os.path.join(temp_dir, item)
 
                     try:
-                        if os.path.isdir(item_path):
-                            mtime = os.path.getmtime(item_path)
-                            age_hours = (datetime.now().timestamp() - mtime) / 3600
+                        mtime = os.path.getmtime(item_path)
+                        age_hours = (datetime.now().timestamp() - mtime) / 3600
 
-                            if age_hours > 3:
+                        if age_hours > 3:
+                            if os.path.isdir(item_path):
                                 shutil.rmtree(item_path)
-                                deleted_count += 1
                                 logger.info(f"Deleted old temp directory: {item}")
+                            else:
+                                # e.g. SRT files left by a killed worker
+                                os.remove(item_path)
+                                logger.info(f"Deleted old temp file: {item}")
+                            deleted_count += 1
 
                     except Exception as e:
                         logger.warning(f"Could not cleanup temp item {item}: {e}")
 
             if deleted_count > 0:
-                logger.info(f"Temp file cleanup: {deleted_count} directories removed")
+                logger.info(f"Temp file cleanup: {deleted_count} items removed")
 
         except Exception as e:
             logger.error(f"Error during temp file cleanup: {e}")
 
+    async def cleanup_media_cache(self) -> None:
+        """
+        Clean up cached media (normalized B-rolls) not used within the TTL
+        """
+        try:
+            if not os.path.exists(settings.media_cache_dir):
+                return
+
+            deleted_count = 0
+            freed_space = 0
+            cutoff = datetime.now().timestamp() - settings.media_cache_ttl_hours * 3600
+
+            for filename in os.listdir(settings.media_cache_dir):
+                file_path = os.path.join(settings.media_cache_dir, filename)
+
+                try:
+                    # Cache hits refresh the mtime, so this is "last used"
+                    if os.path.isfile(file_path) and os.path.getmtime(file_path) < cutoff:
+                        file_size = os.path.getsize(file_path)
+                        os.remove(file_path)
+                        freed_space += file_size
+                        deleted_count += 1
+
+                except Exception as e:
+                    logger.warning(f"Could not cleanup cache file {filename}: {e}")
+
+            if deleted_count > 0:
+                logger.info(
+                    f"Media cache cleanup: {deleted_count} files deleted, "
+                    f"{freed_space / (1024*1024):.2f}MB freed"
+                )
+
+        except Exception as e:
+            logger.error(f"Error during media cache cleanup: {e}")
+
     async def run_all_cleanup(self) -> None:
         """Run all cleanup tasks"""
         await self.cleanup_old_videos()
         await self.cleanup_orphaned_files()
         await self.cleanup_temp_files()
+        await self.cleanup_media_cache()
 
     def start(self) -> None:
         """Start the cleanup scheduler"""
@@ -1,12 +1,417 @@
 import subprocess
+import asyncio
+import hashlib
 import logging
+import io
+import json
 import os
-from typing import List, Tuple
+import re
+import shutil
+import tempfile
+from collections import OrderedDict
+from contextlib import contextmanager, suppress
+from fractions import Fraction
+from functools import lru_cache
+from typing import Any, Awaitable, Callable, Iterator, List, NamedTuple, Optional, Tuple
+from app.config import settings as app_settings
 
 logger = logging.getLogger(__name__)
 
 
-def video_has_audio(video_path: str) -> bool:
+# FFmpeg logs every frame to stderr; only the end of it is ever logged, and
+# errors are reported last, so that is all that's kept
+_STDERR_TAIL_BYTES = 4096
+_PIPE_BUFFER_BYTES = 1024 * 1024
+
+
+async def _read_tail(stream: asyncio.StreamReader, limit: int) -> bytes:
+    """
+    Drain a stream, keeping only its last bytes
+
+    Args:
+        stream: Stream to read until EOF
+        limit: Number of trailing bytes to keep
+
+    Returns:
+        The last `limit` bytes of the stream
+    """
+    tail = bytearray()
+    while chunk := await stream.read(_PIPE_BUFFER_BYTES):
+        tail += chunk
+        if len(tail) > limit:
+            del tail[:-limit]
+    return bytes(tail)
+
+
+def _decode_tail(data: Optional[bytes], limit: int = 1000) -> str:
+    """
+    Decode the end of captured process output for logging
+
+    Only the logged slice is decoded; it may start mid-character and
+    FFmpeg can emit bytes that aren't valid UTF-8, so errors are replaced.
+
+    Args:
+        data: Captured output
+        limit: Number of trailing bytes to decode
+
+    Returns:
+        Decoded text
+    """
+    return (data or b"")[-limit:].decode("utf-8", "replace")
+
+
+async def _run(cmd: List[str], check: bool = True) -> subprocess.CompletedProcess:
+    """
+    Run an ffmpeg/ffprobe command without blocking the event loop
+
+    stderr is drained as it is produced and only its tail is kept, so
+    memory stays constant however long the encode runs.
+
+    Args:
+        cmd: Command and arguments
+        check: Raise if the command exits with a non-zero status
+
+    Returns:
+        CompletedProcess with raw stdout and the tail of stderr, as bytes
+
+    Raises:
+        subprocess.CalledProcessError: If check is set and the command fails
+    """
+    proc = await asyncio.create_subprocess_exec(
+        *cmd,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+        limit=_PIPE_BUFFER_BYTES
+    )
+    try:
+        stdout, stderr = await asyncio.gather(
+            proc.stdout.read(),
+            _read_tail(proc.stderr, _STDERR_TAIL_BYTES)
+        )
+        await proc.wait()
+    except asyncio.CancelledError:
+        # Don't leave an orphaned ffmpeg running when the task is cancelled
+        with suppress(ProcessLookupError):
+            proc.kill()
+        await proc.wait()
+        raise
+
+    result = subprocess.CompletedProcess(cmd, proc.returncode, stdout, stderr)
+    if check and proc.returncode != 0:
+        raise subprocess.CalledProcessError(
+            proc.returncode, cmd, output=result.stdout, stderr=result.stderr
+        )
+    return result
+
+
+def _mp4_output_args(output_path: str) -> Tuple[str, ...]:
+    """
+    Output arguments for final MP4 files
+
+    Moves the moov atom to the front so players and CDNs can start
+    playback before the whole file is downloaded, without a second pass.
+    """
+    return ("-movflags", "+faststart") if output_path.lower().endswith(".mp4") else ()
+
+
+class FFmpegWorkerPool:
+    """
+    Admission control for FFmpeg processes
+
+    FFmpeg has no long-lived job mode, so every job is still its own
+    process. The pool caps how many run at once; extra jobs wait their turn
+    instead of all decoding in parallel and exhausting memory.
+    """
+
+    def __init__(self, size: Optional[int] = None):
+        self.size = size or os.cpu_count() or 1
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        # run_sync() starts a fresh event loop per call, and a semaphore
+        # can't be shared between loops
+        loop = asyncio.get_running_loop()
+        if self._semaphore is None or self._loop is not loop:
+            self._semaphore = asyncio.Semaphore(self.size)
+            self._loop = loop
+        return self._semaphore
+
+    async def run(self, cmd: List[str], check: bool = True) -> subprocess.CompletedProcess:
+        """
+        Run an FFmpeg command once a slot is free
+
+        Args:
+            cmd: Command and arguments
+            check: Raise if the command exits with a non-zero status
+
+        Returns:
+            CompletedProcess with raw stdout and the tail of stderr, as bytes
+
+        Raises:
+            subprocess.CalledProcessError: If check is set and the command fails
+        """
+        semaphore = self._get_semaphore()
+        if semaphore.locked():
+            logger.info(f"All {self.size} FFmpeg slots busy, queueing job")
+        async with semaphore:
+            return await _run(cmd, check=check)
+
+
+ffmpeg_pool = FFmpegWorkerPool(app_settings.ffmpeg_max_processes or None)
+
+
+def run_sync(func: Callable[..., Awaitable[Any]], *args, **kwargs) -> Any:
+    """
+    Run one of the async helpers in this module from synchronous code
+
+    Args:
+        func: Async function, e.g. burn_subtitles
+        *args, **kwargs: Arguments passed to func
+
+    Returns:
+        Whatever func returns
+    """
+    return asyncio.run(func(*args, **kwargs))
+
+
+# Hardware H.264 encoders in order of preference, with their output arguments
+_HW_VIDEO_ENCODERS = {
+    "h264_nvenc": ("-c:v", "h264_nvenc", "-preset", "p1", "-rc", "vbr", "-cq", "23"),
+    "h264_qsv": ("-c:v", "h264_qsv", "-preset", "veryfast", "-global_quality", "23"),
+    "h264_v4l2m2m": ("-c:v", "h264_v4l2m2m", "-b:v", "5M"),
+}
+# ultrafast already disables B-frames and lookahead, so zerolatency's only
+# effect here is sliced threads instead of frame threads: fewer frames in flight
+_LIBX264_ARGS = ("-c:v", "libx264", "-preset", "ultrafast", "-tune", "zerolatency", "-crf", "23")
+
+# Finite bound on packets buffered per stream while the muxer waits for every
+# stream to start. The default of 128 aborts on inputs whose audio starts late.
+_MEM_FLAGS = ("-max_muxing_queue_size", "1024")
+
+# Input arguments that let the decoder use the same device as the encoder.
+# Frames are downloaded to system memory so the CPU filters keep working.
+_HWACCEL_INPUT_ARGS = {
+    "h264_nvenc": ("-hwaccel", "cuda"),
+}
+
+_video_encoder: Optional[str] = None
+_encoder_lock: Optional[asyncio.Lock] = None
+_encoder_lock_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def _get_encoder_lock() -> asyncio.Lock:
+    # Like the pool's semaphore, a lock can't be shared between the loops
+    # run_sync() starts
+    global _encoder_lock, _encoder_lock_loop
+
+    loop = asyncio.get_running_loop()
+    if _encoder_lock is None or _encoder_lock_loop is not loop:
+        _encoder_lock = asyncio.Lock()
+        _encoder_lock_loop = loop
+    return _encoder_lock
+
+
+async def _detect_video_encoder() -> str:
+    """
+    Find the best working H.264 encoder on this host
+
+    Returns:
+        Encoder name, "libx264" if no hardware encoder is usable
+    """
+    try:
+        result = await _run(["ffmpeg", "-hide_banner", "-encoders"])
+    except (OSError, subprocess.CalledProcessError) as e:
+        logger.warning(f"Could not list FFmpeg encoders: {e}")
+        return "libx264"
+
+    available = {
+        fields[1].decode() for fields in map(bytes.split, result.stdout.splitlines()) if len(fields) > 1
+    }
+
+    for name, args in _HW_VIDEO_ENCODERS.items():
+        if name not in available:
+            continue
+        # Builds often list hardware encoders the host has no device for,
+        # so only trust an encoder that can actually encode a frame
+        test_cmd = [
+            "ffmpeg", "-hide_banner", "-v", "error",
+            "-f", "lavfi", "-i", "color=c=black:s=256x256:d=0.1",
+            "-frames:v", "1",
+            *args,
+            "-f", "null", "-"
+        ]
+        test = await _run(test_cmd, check=False)
+        if test.returncode == 0:
+            return name
+        logger.info(f"Encoder {name} is listed but not usable on this host")
+
+    return "libx264"
+
+
+async def _select_video_encoder() -> str:
+    """
+    Get the H.264 encoder to use, detecting it on first call
+
+    Returns:
+        Encoder name
+    """
+    global _video_encoder
+
+    if _video_encoder is not None:
+        return _video_encoder
+
+    # Concurrent first callers (e.g. B-rolls normalized in parallel) wait for
+    # a single detection instead of each probing the GPU
+    async with _get_encoder_lock():
+        if _video_encoder is None:
+            configured = app_settings.video_encoder
+            if configured == "auto":
+                _video_encoder = await _detect_video_encoder()
+            elif configured in _HW_VIDEO_ENCODERS or configured == "libx264":
+                _video_encoder = configured
+            else:
+                logger.warning(f"Unknown VIDEO_ENCODER {configured!r}, falling back to libx264")
+                _video_encoder = "libx264"
+            logger.info(f"Using video encoder: {_video_encoder}")
+
+    return _video_encoder
+
+
+async def _video_encoder_args(
+    x264_preset: Optional[str] = None,
+    x264_tune: Optional[str] = None
+) -> Tuple[Tuple[str, ...], Tuple[str, ...]]:
+    """
+    Get FFmpeg arguments for the selected video encoder
+
+    Args:
+        x264_preset: Override the libx264 preset (ignored for hardware encoders)
+        x264_tune: Override the libx264 tune (ignored for hardware encoders)
+
+    Returns:
+        (arguments placed before the primary input, video codec arguments)
+    """
+    encoder = await _select_video_encoder()
+    if encoder == "libx264" and (x264_preset or x264_tune):
+        return (), (
+            "-c:v", "libx264",
+            "-preset", x264_preset or "ultrafast",
+            "-tune", x264_tune or "zerolatency",
+            "-crf", "23"
+        )
+    return _HWACCEL_INPUT_ARGS.get(encoder, ()), _HW_VIDEO_ENCODERS.get(encoder, _LIBX264_ARGS)
+
+
+class ProbeResult(NamedTuple):
+    """Stream metadata gathered from a single ffprobe call"""
+    duration: Optional[float]
+    has_audio: bool
+    width: Optional[int] = None
+    height: Optional[int] = None
+    frame_rate: Optional[str] = None  # r_frame_rate, e.g. "30000/1001"
+    avg_frame_rate: Optional[str] = None
+
+    @property
+    def constant_frame_rate(self) -> Optional[str]:
+        """
+        Frame rate of a constant-rate video stream, None if variable or unknown
+
+        For variable-rate streams r_frame_rate is only a common multiple of
+        the rates in use (e.g. 90/1 or 1000/1), so it differs from the average.
+        """
+        if not self.frame_rate or not self.avg_frame_rate:
+            return None
+        if Fraction(self.frame_rate) != Fraction(self.avg_frame_rate):
+            return None
+        return self.frame_rate
+
+
+# LRU cache of probe results keyed on (path, mtime, size), so a file that
+# changes on disk is transparently re-probed
+_PROBE_CACHE_SIZE = 256
+_probe_cache: "OrderedDict[Tuple[str, float, int], ProbeResult]" = OrderedDict()
+
+
+async def _probe_streams(path: str) -> ProbeResult:
+    """
+    Fetch duration, audio presence and video geometry of a media file with one ffprobe call
+
+    Args:
+        path: Path to media file
+
+    Returns:
+        ProbeResult (duration is None if the container doesn't report one)
+
+    Raises:
+        subprocess.CalledProcessError: If ffprobe fails
+    """
+    stat = os.stat(path)
+    key = (path, stat.st_mtime, stat.st_size)
+
+    cached = _probe_cache.get(key)
+    if cached is not None:
+        _probe_cache.move_to_end(key)
+        return cached
+
+    cmd = [
+        "ffprobe",
+        "-v", "error",
+        "-show_entries", "format=duration:stream=codec_type,width,height,r_frame_rate,avg_frame_rate",
+        "-of", "json",
+        path
+    ]
+    result = await _run(cmd)
+    data = json.loads(result.stdout)
+
+    streams = data.get("streams", [])
+    video = next((s for s in streams if s.get("codec_type") == "video"), {})
+    frame_rate = video.get("r_frame_rate")
+    avg_frame_rate = video.get("avg_frame_rate")
+    duration = data.get("format", {}).get("duration")
+    probe = ProbeResult(
+        duration=float(duration) if duration is not None else None,
+        has_audio=any(s.get("codec_type") == "audio" for s in streams),
+        width=video.get("width"),
+        height=video.get("height"),
+        frame_rate=frame_rate if frame_rate and not frame_rate.startswith("0") else None,
+        avg_frame_rate=avg_frame_rate if avg_frame_rate and not avg_frame_rate.startswith("0") else None
+    )
+
+    _probe_cache[key] = probe
+    if len(_probe_cache) > _PROBE_CACHE_SIZE:
+        _probe_cache.popitem(last=False)
+    return probe
+
+
+async def probe_many(paths: List[str]) -> List[Optional[ProbeResult]]:
+    """
+    Probe several media files concurrently
+
+    ffprobe spends most of its time starting up and waiting on I/O, so
+    running the calls side by side hides that latency. Cached results are
+    returned without spawning a process.
+
+    Args:
+        paths: Paths to media files
+
+    Returns:
+        ProbeResult per path, in order (None where probing failed)
+    """
+    limit = asyncio.Semaphore(min(32, (os.cpu_count() or 1) * 4))
+
+    async def probe(path: str) -> Optional[ProbeResult]:
+        async with limit:
+            try:
+                return await _probe_streams(path)
+            except Exception as e:
+                logger.warning(f"Could not probe {path}: {e}")
+                return None
+
+    return await asyncio.gather(*(probe(path) for path in paths))
+
+
+async def video_has_audio(video_path: str) -> bool:
     """
     Check if a video file has an audio stream using ffprobe
 
@@ -17,16 +422,7 @@ def video_has_audio(video_path: str) -> bool:
         True if video has audio, False otherwise
     """
     try:
-        cmd = [
-            "ffprobe",
-            "-v", "error",
-            "-select_streams", "a:0",
-            "-show_entries", "stream=codec_type",
-            "-of", "default=noprint_wrappers=1:nokey=1",
-            video_path
-        ]
-        result = subprocess.run(cmd, capture_output=True, text=True)
-        has_audio = result.stdout.strip() == "audio"
+        has_audio = (await _probe_streams(video_path)).has_audio
         logger.info(f"Video {video_path} has audio: {has_audio}")
         return has_audio
     except Exception as e:
@@ -34,7 +430,7 @@ def video_has_audio(video_path: str) -> bool:
         return False
 
 
-def get_video_duration(video_path: str) -> float:
+async def get_video_duration(video_path: str) -> float:
     """
     Get the duration of a video file using ffprobe
 
@@ -45,15 +441,9 @@ def get_video_duration(video_path: str) -> float:
         Duration in seconds, or 5.0 as fallback
     """
     try:
-        cmd = [
-            "ffprobe",
-            "-v", "error",
-            "-show_entries", "format=duration",
-            "-of", "default=noprint_wrappers=1:nokey=1",
-            video_path
-        ]
-        result = subprocess.run(cmd, capture_output=True, text=True, check=True)
-        duration = float(result.stdout.strip())
+        duration = (await _probe_streams(video_path)).duration
+        if duration is None:
+            raise ValueError("no duration reported")
         logger.info(f"Video duration for {video_path}: {duration}s")
         return duration
     except Exception as e:
@@ -61,6 +451,23 @@ def get_video_duration(video_path: str) -> float:
         return 5.0
 
 
+def _format_time_ms(ms: int) -> str:
+    """
+    Format integer milliseconds to SRT timestamp format (HH:MM:SS,mmm)
+
+    Args:
+        ms: Time in milliseconds
+
+    Returns:
+        Formatted timestamp string
+    """
+    hours, ms = divmod(ms, 3600000)
+    minutes, ms = divmod(ms, 60000)
+    secs, ms = divmod(ms, 1000)
+
+    return f"{hours:02}:{minutes:02}:{secs:02},{ms:03}"
+
+
 def format_time(seconds: float) -> str:
     """
     Format time in seconds to SRT timestamp format (HH:MM:SS,mmm)
@@ -71,11 +478,7 @@ def format_time(seconds: float) -> str:
     Returns:
         Formatted timestamp string
     """
-    hours, remainder = divmod(seconds, 3600)
-    minutes, secs = divmod(remainder, 60)
-    milliseconds = int((secs - int(secs)) * 1000)
-
-    return f"{int(hours):02}:{int(minutes):02}:{int(secs):02},{milliseconds:03}"
+    return _format_time_ms(int(round(seconds * 1000)))
 
 
 def write_srt(subtitles, max_words_per_line: int = 3) -> str:
@@ -87,108 +490,201 @@ def write_srt(subtitles, max_words_per_line: int = 3) -> str:
     Returns:
         SRT formatted string
     """
-    srt_output = []
+    buf = io.StringIO()
+    write = buf.write
+    per_line = max_words_per_line
     counter = 1
     for seg in subtitles:
-        start = seg["start"]
-        end = seg["end"]
+        # Work in integer milliseconds so chunk boundaries round exactly
+        start_ms = int(round(seg["start"] * 1000))
+        duration_ms = int(round(seg["end"] * 1000)) - start_ms
         text = seg["text"].strip()
-        words = text.split()
-        duration = end - start
-        if len(words) <= max_words_per_line:
-            chunks = [text]
+        words = tuple(text.split())
+        if len(words) <= per_line:
+            chunks = (text,)
         else:
-            chunks = []
-            for i in range(0, len(words), max_words_per_line):
-                chunk = " ".join(words[i:i + max_words_per_line])
-                chunks.append(chunk)
-        chunk_duration = duration / len(chunks)
-        for idx, chunk in enumerate(chunks):
-            chunk_start = start + (idx * chunk_duration)
-            chunk_end = start + ((idx + 1) * chunk_duration)
-            srt_output.append(
-                f"{counter}\n{format_time(chunk_start)} --> {format_time(chunk_end)}\n{chunk}\n"
-            )
+            chunks = [" ".join(words[i:i + per_line]) for i in range(0, len(words), per_line)]
+        n_chunks = len(chunks)
+        chunk_start_ms = start_ms
+        for idx, chunk in enumerate(chunks, 1):
+            chunk_end_ms = start_ms + (idx * duration_ms) // n_chunks
+            write(f"{counter}\n{_format_time_ms(chunk_start_ms)} --> {_format_time_ms(chunk_end_ms)}\n{chunk}\n\n")
+            chunk_start_ms = chunk_end_ms
             counter += 1
-    return "\n".join(srt_output)
+    return buf.getvalue()
+
+
+DEFAULT_CAPTION_SETTINGS = {
+    "shadow-color": "#000000",
+    "max-words-per-line": 3,
+    "font-size": 10,
+    "shadow-offset": 0.3,
+    "outline-color": "#000000",
+    "word-color": "#FFFFFF",
+    "outline-width": 0.5,
+    "y": 50,  # vertical distance from bottom
+    "font-family": "Montserrat-Bold",
+    "bold": True
+}
+
+
+@contextmanager
+def _srt_file(srt_text: str) -> Iterator[str]:
+    """
+    Write SRT text to a unique temp file for the subtitles filter
+
+    This has to be a regular file rather than a named pipe or /dev/stdin:
+    FFmpeg may open it more than once while building the filter graph.
+
+    Args:
+        srt_text: SRT formatted subtitles
+
+    Yields:
+        Path to the SRT file, removed on exit
+    """
+    # A unique temp file works for any input extension and can't collide
+    # with a concurrent burn of the same video
+    with tempfile.NamedTemporaryFile(
+        mode="w", prefix="srt_", suffix=".srt", delete=False, encoding="utf-8"
+    ) as srt_file:
+        srt_file.write(srt_text)
+        srt_path = srt_file.name
+    try:
+        yield srt_path
+    finally:
+        if os.path.exists(srt_path):
+            os.remove(srt_path)
+
+
+@lru_cache(maxsize=64)
+def hex_to_ass_color(hex_color: str) -> str:
+    """
+    Convert a #RRGGBB hex color to ASS format (&H00BBGGRR)
+
+    Args:
+        hex_color: Color such as "#FFCC00"
+
+    Returns:
+        ASS color string
+    """
+    v = int(hex_color.lstrip('#'), 16)
+    return f"&H00{v & 0xff:02X}{(v >> 8) & 0xff:02X}{(v >> 16) & 0xff:02X}"
+
+
+def _escape_filter_path(path: str) -> str:
+    """
+    Escape a file path for use as a filter option value in a filter graph
+
+    FFmpeg unescapes twice: once when splitting the graph into filters and
+    once when splitting a filter's options, so the path is escaped for
+    both levels.
+
+    Args:
+        path: File path
+
+    Returns:
+        Escaped path
+    """
+    if os.sep == "\\":
+        path = path.replace("\\", "/")
+    option_escaped = re.sub(r"([\\':])", r"\\\1", path)
+    return re.sub(r"([\\'\[\],;])", r"\\\1", option_escaped)
+
+
+@lru_cache(maxsize=32)
+def _build_force_style(style_key: Tuple[Tuple[str, Any], ...]) -> str:
+    """
+    Build the ASS force_style value for a set of caption settings
+
+    Args:
+        style_key: Caption styling settings as sorted (key, value) pairs
+
+    Returns:
+        Comma-separated ASS style overrides
+    """
+    settings = dict(style_key)
+
+    primary_color = hex_to_ass_color(settings["word-color"])
+    outline_color = hex_to_ass_color(settings["outline-color"])
+    shadow_color = hex_to_ass_color(settings["shadow-color"])
+
+    return (
+        f"FontName={settings['font-family']},"
+        f"FontSize={settings['font-size']},"
+        f"Bold=1,"
+        f"PrimaryColour={primary_color},"
+        f"OutlineColour={outline_color},"
+        f"BackColour={shadow_color},"
+        f"BorderStyle=1,"
+        f"Outline={settings['outline-width']},"
+        f"Shadow={settings['shadow-offset']},"
+        f"Alignment=2,"  # bottom centre
+        f"MarginV={int(settings['y'])}"
+    )
+
+
+def _build_subtitle_filter(srt_path: str, settings: dict) -> str:
+    """
+    Build the styled subtitles filter for an SRT file
+
+    Args:
+        srt_path: Path to SRT file
+        settings: Caption styling settings
 
+    Returns:
+        subtitles=... filter string
+    """
+    srt_path_escaped = _escape_filter_path(srt_path)
+    # Styles repeat across videos, so the style string is built once per set
+    force_style = _build_force_style(tuple(sorted(settings.items())))
+    return f"subtitles={srt_path_escaped}:force_style='{force_style}'"
 
-def burn_subtitles(video_path: str, srt_text: str, output_path: str, settings: dict = None) -> None:
+
+async def burn_subtitles(video_path: str, srt_text: str, output_path: str, settings: dict = None) -> None:
     """
     Burn subtitles into video using FFmpeg with custom styling
     Args:
         video_path: Path to input video
         srt_text: SRT formatted subtitles
         output_path: Path for output video
-        settings: Caption styling settings
+        settings: Caption styling settings; "x264-preset" and "x264-tune"
+            override the libx264 encode (default superfast, fastdecode,zerolatency)
     Raises:
         subprocess.CalledProcessError: If FFmpeg fails
     """
-    # Default settings
     if settings is None:
-        settings = {
-            "shadow-color": "#000000",
-            "max-words-per-line": 3,
-            "font-size": 10,
-            "shadow-offset": 0.3,
-            "outline-color": "#000000",
-            "word-color": "#FFFFFF",
-            "outline-width": 0.5,
-                "y": 50,  # vertical distance from bottom
-            "font-family": "Montserrat-Bold",
-            "bold": True
-        }
-    
-    srt_path = video_path.replace(".mp4", "_temp.srt")
+        settings = DEFAULT_CAPTION_SETTINGS
+
     try:
-        with open(srt_path, "w", encoding="utf-8") as srt_file:
-            srt_file.write(srt_text)
-        logger.info(f"Burning subtitles into video: {video_path}")
-        srt_path_escaped = srt_path.replace("\\", "/").replace(":", "\\:")
-        
-        # Convert hex colors to ASS format (&H00BBGGRR)
-        def hex_to_ass_color(hex_color):
-            hex_color = hex_color.lstrip('#')
-            r, g, b = hex_color[0:2], hex_color[2:4], hex_color[4:6]
-            return f"&H00{b}{g}{r}"
-        
-        primary_color = hex_to_ass_color(settings["word-color"])
-        outline_color = hex_to_ass_color(settings["outline-color"])
-        shadow_color = hex_to_ass_color(settings["shadow-color"])
-        
-        # Build subtitle filter with custom styling
-        subtitle_filter = (
-            f"subtitles={srt_path_escaped}:force_style='"
-            f"FontName={settings['font-family']},"
-            f"FontSize={settings['font-size']},"
-            f"Bold=1,"
-            f"PrimaryColour={primary_color},"
-            f"OutlineColour={outline_color},"
-            f"BackColour={shadow_color},"
-            f"BorderStyle=1,"
-            f"Outline={settings['outline-width']},"
-            f"Shadow={settings['shadow-offset']},"
-            f"Alignment=2,"  # bottom centre
-            f"MarginV={int(settings['y'])}'" 
-        )
-        
-        cmd = [
-            "ffmpeg",
-            "-y",
-            "-threads", "0",
-            "-i", video_path,
-            "-vf", subtitle_filter,
-            "-c:v", "libx264",
-            "-preset", "ultrafast",
-            "-crf", "23",
-            "-c:a", "copy",
-            output_path
-        ]
-        logger.info(f"Running FFmpeg subtitle burn command...")
-        logger.info(f"Subtitle filter: {subtitle_filter[:100]}...")
-        logger.info(f"Full command: {' '.join(cmd)}")
+        with _srt_file(srt_text) as srt_path:
+            logger.info(f"Burning subtitles into video: {video_path}")
+            subtitle_filter = _build_subtitle_filter(srt_path, settings)
+            # The burn is a single CPU-bound pass: superfast yields a leaner
+            # stream per cycle than ultrafast, fastdecode lightens playback
+            input_args, encoder_args = await _video_encoder_args(
+                x264_preset=settings.get("x264-preset", "superfast"),
+                x264_tune=settings.get("x264-tune", "fastdecode,zerolatency")
+            )
 
-        result = subprocess.run(cmd, capture_output=True, text=True, check=True)
+            cmd = [
+                "ffmpeg",
+                "-y",
+                "-threads", "0",
+                *input_args,
+                "-fflags", "+genpts",
+                "-i", video_path,
+                "-vf", subtitle_filter,
+                *encoder_args,
+                *_MEM_FLAGS,
+                "-c:a", "copy",
+                *_mp4_output_args(output_path),
+                output_path
+            ]
+            logger.info(f"Running FFmpeg subtitle burn command...")
+            logger.info(f"Subtitle filter: {subtitle_filter[:100]}...")
+            logger.info(f"Full command: {' '.join(cmd)}")
+
+            result = await ffmpeg_pool.run(cmd)
 
         logger.info(f"FFmpeg completed with return code: {result.returncode}")
         logger.info(f"Subtitles burned successfully: {output_path}")
@@ -200,17 +696,15 @@ def burn_subtitles(video_path: str, srt_text: str, output_path: str, settings: d
             logger.error(f"Output file does not exist: {output_path}")
 
         if result.stderr:
-            logger.info(f"FFmpeg stderr output: {result.stderr[-1000:]}")
+            logger.info(f"FFmpeg stderr output: {_decode_tail(result.stderr)}")
         if result.stdout:
-            logger.info(f"FFmpeg stdout output: {result.stdout[-500:]}")
+            logger.info(f"FFmpeg stdout output: {_decode_tail(result.stdout, 500)}")
     except subprocess.CalledProcessError as e:
-        logger.error(f"FFmpeg error: {e.stderr}")
+        logger.error(f"FFmpeg error: {_decode_tail(e.stderr, _STDERR_TAIL_BYTES)}")
         raise
-    finally:
-        if os.path.exists(srt_path):
-            os.remove(srt_path)
 
-def merge_video_audio(
+
+async def merge_video_audio(
     video_path: str,
     audio_path: str,
     output_path: str,
@@ -247,7 +741,7 @@ def merge_video_audio(
             scale_filter = f"[0:v]scale={width}:{height}:force_original_aspect_ratio=decrease,pad={width}:{height}:(ow-iw)/2:(oh-ih)/2[v]"
 
         # Check if video has audio
-        has_audio = video_has_audio(video_path)
+        has_audio = await video_has_audio(video_path)
 
         if has_audio:
             # Video has audio - mix it with the new audio
@@ -265,34 +759,38 @@ def merge_video_audio(
                 f"[1:a]volume={audio_volume},atrim=duration={duration},asetpts=PTS-STARTPTS[a]"
             )
 
+        input_args, encoder_args = await _video_encoder_args()
+
         cmd = [
             "ffmpeg", "-y",
             "-threads", "0",
+            *input_args,
+            "-fflags", "+genpts",
             "-i", video_path,
             "-i", audio_path,
             "-t", str(duration),
             "-filter_complex", filter_complex,
             "-map", "[v]",
             "-map", "[a]",
-            "-c:v", "libx264",
-            "-preset", "ultrafast",
-            "-crf", "23",
+            *encoder_args,
+            *_MEM_FLAGS,
             "-c:a", "aac",
             "-b:a", "128k",
             "-ar", "48000",
             "-ac", "2",
+            *_mp4_output_args(output_path),
             output_path
         ]
 
-        result = subprocess.run(cmd, capture_output=True, text=True, check=True)
+        result = await ffmpeg_pool.run(cmd)
         logger.info(f"Video and audio merged: {output_path}")
 
     except subprocess.CalledProcessError as e:
-        logger.error(f"FFmpeg merge error: {e.stderr}")
+        logger.error(f"FFmpeg merge error: {_decode_tail(e.stderr, _STDERR_TAIL_BYTES)}")
         raise
 
 
-def concat_videos(video_list_path: str, output_path: str) -> None:
+async def concat_videos(video_list_path: str, output_path: str) -> None:
     """
     Concatenate multiple videos using FFmpeg concat demuxer
 
@@ -308,22 +806,150 @@ def concat_videos(video_list_path: str, output_path: str) -> None:
 
         cmd = [
             "ffmpeg", "-y",
+            "-fflags", "+genpts",
             "-f", "concat",
             "-safe", "0",
             "-i", video_list_path,
             "-c", "copy",
+            *_mp4_output_args(output_path),
             output_path
         ]
 
-        result = subprocess.run(cmd, capture_output=True, text=True, check=True)
+        result = await ffmpeg_pool.run(cmd)
         logger.info(f"Videos concatenated: {output_path}")
 
     except subprocess.CalledProcessError as e:
-        logger.error(f"FFmpeg concat error: {e.stderr}")
+        logger.error(f"FFmpeg concat error: {_decode_tail(e.stderr, _STDERR_TAIL_BYTES)}")
         raise
 
 
-def add_background_music(
+_LOUDNORM_TARGET = "I=-16:TP=-1.5:LRA=11"
+
+# Strong references to fire-and-forget normalization tasks, and the music
+# digests currently being normalized
+_background_tasks: set = set()
+_music_normalizing: set = set()
+
+
+def _is_normalized(music_path: str) -> bool:
+    """Check for the sidecar marking a music file as already loudness-normalized"""
+    return os.path.exists(f"{music_path}.loudnorm.json")
+
+
+async def _normalize_music(source_path: str, cached_path: str) -> None:
+    """
+    Two-pass loudnorm a music file into the media cache
+
+    The first pass measures the track, the second applies a linear gain
+    from those measurements. A sidecar with the measurements marks the
+    cached file as normalized.
+
+    Args:
+        source_path: Private copy of the music file, removed when done
+        cached_path: Where to publish the normalized file
+
+    Raises:
+        subprocess.CalledProcessError: If FFmpeg fails
+    """
+    partial_path = None
+    try:
+        measure_cmd = [
+            "ffmpeg", "-hide_banner", "-nostats",
+            "-i", source_path,
+            "-af", f"loudnorm={_LOUDNORM_TARGET}:print_format=json",
+            "-f", "null", "-"
+        ]
+        result = await ffmpeg_pool.run(measure_cmd)
+        # loudnorm prints its JSON summary last
+        summary = _decode_tail(result.stderr, _STDERR_TAIL_BYTES)
+        measured = json.loads(summary[summary.rindex("{"):summary.rindex("}") + 1])
+
+        fd, partial_path = tempfile.mkstemp(suffix=".m4a", dir=app_settings.media_cache_dir)
+        os.close(fd)
+        apply_cmd = [
+            "ffmpeg", "-y",
+            "-i", source_path,
+            "-af",
+            f"loudnorm={_LOUDNORM_TARGET}"
+            f":measured_I={measured['input_i']}"
+            f":measured_TP={measured['input_tp']}"
+            f":measured_LRA={measured['input_lra']}"
+            f":measured_thresh={measured['input_thresh']}"
+            f":offset={measured['target_offset']}"
+            f":linear=true",
+            "-vn",
+            "-c:a", "aac",
+            "-b:a", "192k",
+            "-ar", "48000",
+            partial_path
+        ]
+        await ffmpeg_pool.run(apply_cmd)
+
+        os.replace(partial_path, cached_path)
+        with open(f"{cached_path}.loudnorm.json", "w") as f:
+            json.dump(measured, f)
+        logger.info(f"Normalized music cached: {cached_path}")
+
+    finally:
+        for path in (source_path, partial_path):
+            if path and os.path.exists(path):
+                os.remove(path)
+
+
+async def _resolve_music(music_path: str) -> Tuple[str, bool]:
+    """
+    Pick the music file to mix and whether it still needs loudnorm
+
+    Tracks with a .loudnorm.json sidecar are used as-is. Otherwise a
+    previously normalized copy is looked up in the media cache by content.
+    On a miss, this call still normalizes inline with single-pass loudnorm,
+    while a background job produces the cached copy for future calls.
+
+    Args:
+        music_path: Path to music file
+
+    Returns:
+        (path to use as the music input, True if loudnorm must be applied)
+    """
+    if _is_normalized(music_path):
+        return music_path, False
+
+    digest = await asyncio.to_thread(_file_digest, music_path)
+    cached_path = os.path.join(app_settings.media_cache_dir, f"{digest}_loudnorm.m4a")
+
+    if os.path.exists(cached_path) and _is_normalized(cached_path):
+        os.utime(cached_path)
+        os.utime(f"{cached_path}.loudnorm.json")
+        logger.info(f"Using cached normalized music for {music_path}")
+        return cached_path, False
+
+    if digest not in _music_normalizing:
+        # Work from a private copy; the caller deletes its temp files as
+        # soon as the mix is done
+        os.makedirs(app_settings.media_cache_dir, exist_ok=True)
+        fd, source_copy = tempfile.mkstemp(
+            suffix=os.path.splitext(music_path)[1], dir=app_settings.media_cache_dir
+        )
+        os.close(fd)
+        await asyncio.to_thread(shutil.copyfile, music_path, source_copy)
+
+        async def normalize():
+            try:
+                await _normalize_music(source_copy, cached_path)
+            except Exception as e:
+                logger.warning(f"Background music normalization failed for {music_path}: {e}")
+            finally:
+                _music_normalizing.discard(digest)
+
+        _music_normalizing.add(digest)
+        task = asyncio.create_task(normalize())
+        _background_tasks.add(task)
+        task.add_done_callback(_background_tasks.discard)
+
+    return music_path, True
+
+
+async def add_background_music(
     video_path: str,
     music_path: str,
     output_path: str,
@@ -342,37 +968,45 @@ def add_background_music(
         subprocess.CalledProcessError: If FFmpeg fails
     """
     try:
-        video_duration = get_video_duration(video_path)
+        video_duration = await get_video_duration(video_path)
         logger.info(f"Adding background music to video (duration: {video_duration}s)")
         logger.info(f"Settings: music_volume={music_volume}, video_volume={video_volume}")
 
-        # Use loudnorm filter to normalize audio first, then apply volume
+        music_input, needs_loudnorm = await _resolve_music(music_path)
+        loudnorm = f"loudnorm={_LOUDNORM_TARGET}," if needs_loudnorm else ""
+
+        # Normalize the music loudness first (unless already done), then apply
+        # volume. Looping happens in the demuxer (-stream_loop), not in the graph.
         filter_complex = (
-            f"[1:a]loudnorm=I=-16:TP=-1.5:LRA=11,volume={music_volume},"
-            f"aloop=loop=-1:size=2e+09,atrim=duration={video_duration}[ma];"
+            f"[1:a]{loudnorm}volume={music_volume}[ma];"
             f"[0:a]volume={video_volume}[va];"
             f"[va][ma]amix=inputs=2:duration=first:dropout_transition=2[a]"
         )
 
         cmd = [
             "ffmpeg", "-y",
+            "-fflags", "+genpts",
             "-i", video_path,
-            "-i", music_path,
+            "-stream_loop", "-1",
+            "-t", str(video_duration),
+            "-i", music_input,
             "-filter_complex", filter_complex,
             "-map", "0:v",
             "-map", "[a]",
             "-c:v", "copy",
+            *_MEM_FLAGS,
             "-c:a", "aac",
             "-b:a", "192k",
             "-ar", "48000",
             "-shortest",
+            *_mp4_output_args(output_path),
             output_path
         ]
 
         logger.info(f"Running FFmpeg background music command...")
         logger.info(f"Full command: {' '.join(cmd)}")
 
-        result = subprocess.run(cmd, capture_output=True, text=True, check=True)
+        result = await ffmpeg_pool.run(cmd)
 
         logger.info(f"FFmpeg completed with return code: {result.returncode}")
         logger.info(f"Background music added: {output_path}")
@@ -384,14 +1018,536 @@ def add_background_music(
             logger.error(f"Output file does not exist: {output_path}")
 
         if result.stderr:
-            logger.info(f"FFmpeg stderr output: {result.stderr[-1000:]}")
+            logger.info(f"FFmpeg stderr output: {_decode_tail(result.stderr)}")
+
+    except subprocess.CalledProcessError as e:
+        logger.error(f"FFmpeg background music error: {_decode_tail(e.stderr, _STDERR_TAIL_BYTES)}")
+        raise
+
+
+async def produce_final_video(
+    video_path: str,
+    voice_path: str,
+    music_path: str,
+    srt_text: str,
+    output_path: str,
+    settings: dict = None,
+    video_volume: float = 0.2,
+    voice_volume: float = 2.0,
+    music_volume: float = 2.0,
+    duration: Optional[float] = None,
+    width: int = 1080,
+    height: int = 1920,
+    resize_mode: str = "cover"
+) -> None:
+    """
+    Merge voiceover, burn subtitles and add background music in one FFmpeg pass
+
+    Equivalent to merge_video_audio -> burn_subtitles -> add_background_music,
+    but the video is decoded and encoded only once and no intermediate files
+    are written.
+
+    Args:
+        video_path: Path to video file
+        voice_path: Path to voiceover audio file
+        music_path: Path to background music file
+        srt_text: SRT formatted subtitles
+        output_path: Path for output video
+        settings: Caption styling settings
+        video_volume: Volume level for video audio
+        voice_volume: Volume level for voiceover
+        music_volume: Volume multiplier for background music
+        duration: Output duration, defaults to the video duration
+        width: Output width
+        height: Output height
+        resize_mode: "cover" or "contain"
+
+    Raises:
+        subprocess.CalledProcessError: If FFmpeg fails
+    """
+    if settings is None:
+        settings = DEFAULT_CAPTION_SETTINGS
+
+    try:
+        if duration is None:
+            duration = await get_video_duration(video_path)
+        logger.info(f"Producing final video from {video_path} (duration: {duration}s)")
+
+        if resize_mode == "cover":
+            scale_filter = f"scale={width}:{height}:force_original_aspect_ratio=increase,crop={width}:{height}"
+        else:
+            scale_filter = f"scale={width}:{height}:force_original_aspect_ratio=decrease,pad={width}:{height}:(ow-iw)/2:(oh-ih)/2"
+
+        has_audio = await video_has_audio(video_path)
+        music_input, needs_loudnorm = await _resolve_music(music_path)
+        loudnorm = f"loudnorm={_LOUDNORM_TARGET}," if needs_loudnorm else ""
+
+        with _srt_file(srt_text) as srt_path:
+            subtitle_filter = _build_subtitle_filter(srt_path, settings)
+
+            filter_parts = [
+                f"[0:v]{scale_filter},{subtitle_filter}[v]",
+                f"[1:a]volume={voice_volume},atrim=duration={duration},asetpts=PTS-STARTPTS[aa]",
+                f"[2:a]{loudnorm}volume={music_volume}[ma]"
+            ]
+            if has_audio:
+                # Weights reproduce the levels of the two chained 2-input amix
+                # passes (video 1/4, voice 1/4, music 1/2)
+                filter_parts.append(f"[0:a]volume={video_volume}[va]")
+                filter_parts.append("[va][aa][ma]amix=inputs=3:duration=first:weights=1 1 2[a]")
+            else:
+                logger.info("Video has no audio stream, mixing only voiceover and music")
+                filter_parts.append("[aa][ma]amix=inputs=2:duration=first[a]")
+
+            filter_complex = ";".join(filter_parts)
+            input_args, encoder_args = await _video_encoder_args()
+
+            cmd = [
+                "ffmpeg", "-y",
+                "-threads", "0",
+                *input_args,
+                "-fflags", "+genpts",
+                "-i", video_path,
+                "-i", voice_path,
+                "-stream_loop", "-1",
+                "-t", str(duration),
+                "-i", music_input,
+                "-t", str(duration),
+                "-filter_complex", filter_complex,
+                "-map", "[v]",
+                "-map", "[a]",
+                *encoder_args,
+                *_MEM_FLAGS,
+                "-c:a", "aac",
+                "-b:a", "192k",
+                "-ar", "48000",
+                "-ac", "2",
+                *_mp4_output_args(output_path),
+                output_path
+            ]
+
+            logger.info(f"Full command: {' '.join(cmd)}")
+            result = await ffmpeg_pool.run(cmd)
+
+        logger.info(f"Final video produced: {output_path}")
+
+        if os.path.exists(output_path):
+            output_size = os.path.getsize(output_path) / (1024 * 1024)
+            logger.info(f"Output file size: {output_size:.2f}MB")
+        else:
+            logger.error(f"Output file does not exist: {output_path}")
+
+        if result.stderr:
+            logger.info(f"FFmpeg stderr output: {_decode_tail(result.stderr)}")
 
     except subprocess.CalledProcessError as e:
-        logger.error(f"FFmpeg background music error: {e.stderr}")
+        logger.error(f"FFmpeg final video error: {_decode_tail(e.stderr, _STDERR_TAIL_BYTES)}")
         raise
 
 
-def insert_brolls_ffmpeg(
+def _file_digest(path: str) -> str:
+    """SHA-256 hex digest of a file's contents"""
+    with open(path, "rb") as f:
+        return hashlib.file_digest(f, "sha256").hexdigest()
+
+
+def _segment_format_filter(frame_rate: Optional[str]) -> str:
+    """
+    Filters giving clips a uniform frame rate, pixel format and square pixels
+
+    Clips encoded with the same encoder settings after this filter can be
+    joined with the concat demuxer without re-encoding.
+    """
+    return f"fps={frame_rate},setsar=1,format=yuv420p" if frame_rate else "setsar=1,format=yuv420p"
+
+
+async def _normalize_broll(
+    broll_path: str,
+    width: int = 1080,
+    height: int = 1920,
+    frame_rate: Optional[str] = None
+) -> str:
+    """
+    Scale and crop a B-roll clip to the output size, caching the result
+
+    The cache is keyed on the clip contents, so the same B-roll reused
+    across tasks is only transcoded once.
+
+    Args:
+        broll_path: Path to B-roll video file
+        width: Output width
+        height: Output height
+        frame_rate: Output frame rate (e.g. "30/1"), unchanged if None
+
+    Returns:
+        Path to the normalized clip (video only)
+
+    Raises:
+        subprocess.CalledProcessError: If FFmpeg fails
+    """
+    input_args, encoder_args = await _video_encoder_args()
+    digest = await asyncio.to_thread(_file_digest, broll_path)
+    encoder = encoder_args[1]
+    rate_key = frame_rate.replace("/", "-") if frame_rate else "src"
+    cached_path = os.path.join(
+        app_settings.media_cache_dir, f"{digest}_{width}x{height}_{rate_key}_{encoder}_sar1.mp4"
+    )
+
+    if os.path.exists(cached_path):
+        os.utime(cached_path)
+        logger.info(f"Using cached normalized B-roll for {broll_path}")
+        return cached_path
+
+    os.makedirs(app_settings.media_cache_dir, exist_ok=True)
+    fd, partial_path = tempfile.mkstemp(suffix=".mp4", dir=app_settings.media_cache_dir)
+    os.close(fd)
+
+    cmd = [
+        "ffmpeg", "-y",
+        *input_args,
+        "-i", broll_path,
+        "-vf", f"scale={width}:{height}:force_original_aspect_ratio=increase,crop={width}:{height},"
+               f"{_segment_format_filter(frame_rate)}",
+        "-an",
+        *encoder_args,
+        *_MEM_FLAGS,
+        partial_path
+    ]
+
+    try:
+        logger.info(f"Normalizing B-roll {broll_path} to {width}x{height}")
+        await ffmpeg_pool.run(cmd)
+        # Publish atomically so concurrent tasks never read a partial file
+        os.replace(partial_path, cached_path)
+    except subprocess.CalledProcessError as e:
+        logger.error(f"FFmpeg B-roll normalize error: {_decode_tail(e.stderr, _STDERR_TAIL_BYTES)}")
+        raise
+    finally:
+        if os.path.exists(partial_path):
+            os.remove(partial_path)
+
+    return cached_path
+
+
+def _timings_are_disjoint(timings: List[Tuple[float, float]]) -> bool:
+    """Check that no two (start, end) windows overlap"""
+    ordered = sorted(timings)
+    return all(prev[1] <= cur[0] for prev, cur in zip(ordered, ordered[1:]))
+
+
+def _chained_overlay_filters(broll_timings: List[Tuple[float, float]]) -> List[str]:
+    """
+    Overlay every B-roll on the full main video, one overlay after another
+
+    Works for any timings, but every frame passes through every overlay.
+    Expects B-roll streams labelled [vb1]..[vbN] starting at pts 0.
+
+    Args:
+        broll_timings: List of (start, end) tuples, in input order
+
+    Returns:
+        Filter graph parts ending in [outv]
+    """
+    filter_parts = []
+    current_label = "[0:v]"
+
+    for i, (start_time, end_time) in enumerate(broll_timings):
+        filter_parts.append(f"[vb{i+1}]setpts=PTS+{start_time}/TB[vd{i+1}]")
+        out_label = "[outv]" if i == len(broll_timings) - 1 else f"[v{i+1}]"
+        filter_parts.append(
+            f"{current_label}[vd{i+1}]overlay=enable='between(t,{start_time},{end_time})'{out_label}"
+        )
+        current_label = out_label
+
+    return filter_parts
+
+
+def _segmented_overlay_filters(broll_timings: List[Tuple[float, float]]) -> List[str]:
+    """
+    Split the main video at the B-roll windows and overlay each window separately
+
+    Requires non-overlapping timings. Each window becomes an independent
+    branch with a single overlay, so frames outside the windows skip the
+    overlays entirely and the branches can be processed on separate filter
+    threads. The segments are joined back with the concat filter.
+    Expects B-roll streams labelled [vb1]..[vbN] starting at pts 0.
+
+    Args:
+        broll_timings: List of (start, end) tuples, in input order
+
+    Returns:
+        Filter graph parts ending in [outv]
+    """
+    # (start, end, B-roll index); end None means "until the end of the video"
+    segments = []
+    cursor = 0.0
+    for i in sorted(range(len(broll_timings)), key=lambda i: broll_timings[i][0]):
+        start_time, end_time = broll_timings[i]
+        if start_time > cursor:
+            segments.append((cursor, start_time, None))
+        segments.append((start_time, end_time, i))
+        cursor = end_time
+    segments.append((cursor, None, None))
+
+    split_labels = "".join(f"[m{k}]" for k in range(len(segments)))
+    filter_parts = [f"[0:v]split={len(segments)}{split_labels}"]
+    concat_labels = []
+
+    for k, (start_time, end_time, broll_index) in enumerate(segments):
+        trim = f"trim=start={start_time}" if end_time is None else f"trim=start={start_time}:end={end_time}"
+        filter_parts.append(f"[m{k}]{trim},setpts=PTS-STARTPTS[s{k}]")
+        if broll_index is None:
+            concat_labels.append(f"[s{k}]")
+        else:
+            # Cut the B-roll to its window so a longer clip can't stretch the
+            # segment; a shorter one still holds its last frame (eof_action=repeat)
+            filter_parts.append(f"[vb{broll_index+1}]trim=end={end_time - start_time}[vt{k}]")
+            filter_parts.append(f"[s{k}][vt{k}]overlay[o{k}]")
+            concat_labels.append(f"[o{k}]")
+
+    filter_parts.append(f"{''.join(concat_labels)}concat=n={len(segments)}:v=1:a=0[outv]")
+    return filter_parts
+
+
+def _can_splice_brolls(
+    main_probe: Optional[ProbeResult],
+    broll_probes: List[Optional[ProbeResult]],
+    broll_timings: List[Tuple[float, float]],
+    width: int = 1080,
+    height: int = 1920
+) -> bool:
+    """
+    Check whether overlaying the B-rolls is the same as cutting them in
+
+    Normalized B-rolls are opaque and full-frame, so when the main video has
+    the same size and constant frame rate, every B-roll lasts its whole
+    window and the windows don't overlap, the overlay simply replaces those
+    stretches of the main video.
+    """
+    if not main_probe or main_probe.duration is None or main_probe.constant_frame_rate is None:
+        return False
+    if (main_probe.width, main_probe.height) != (width, height):
+        return False
+    if not _timings_are_disjoint(broll_timings):
+        return False
+
+    for probe, (start_time, end_time) in zip(broll_probes, broll_timings):
+        if not probe or probe.duration is None or probe.constant_frame_rate != main_probe.constant_frame_rate:
+            return False
+        if start_time < 0 or end_time > main_probe.duration or probe.duration < end_time - start_time:
+            return False
+
+    return True
+
+
+async def _encode_main_segment(
+    main_video_path: str,
+    start_time: float,
+    end_time: Optional[float],
+    frame_rate: str,
+    output_path: str
+) -> None:
+    """
+    Re-encode a stretch of the main video (no audio) for splicing
+
+    Args:
+        main_video_path: Path to main video file
+        start_time: Segment start in seconds
+        end_time: Segment end in seconds, None for the end of the video
+        frame_rate: Frame rate shared with the B-roll segments
+        output_path: Path for the segment
+
+    Raises:
+        subprocess.CalledProcessError: If FFmpeg fails
+    """
+    input_args, encoder_args = await _video_encoder_args()
+
+    cmd = ["ffmpeg", "-y", *input_args, "-ss", str(start_time), "-i", main_video_path]
+    if end_time is not None:
+        cmd.extend(["-t", str(end_time - start_time)])
+    cmd.extend([
+        "-vf", _segment_format_filter(frame_rate),
+        "-an",
+        *encoder_args,
+        *_MEM_FLAGS,
+        output_path
+    ])
+
+    await ffmpeg_pool.run(cmd)
+
+
+def _concat_escape(path: str) -> str:
+    """Escape a path for a single-quoted concat demuxer 'file' line"""
+    return path.replace("\\", "/").replace("'", "'\\''")
+
+
+async def _splice_brolls(
+    main_video_path: str,
+    main_probe: ProbeResult,
+    broll_paths: List[str],
+    broll_timings: List[Tuple[float, float]],
+    output_path: str
+) -> subprocess.CompletedProcess:
+    """
+    Cut B-rolls into the main video with the concat demuxer
+
+    Only the stretches of the main video between B-rolls are re-encoded,
+    with the same settings the B-rolls were normalized with, so all
+    segments share codec parameters and are joined with stream copy.
+    The main video's audio is laid over the result.
+
+    Args:
+        main_video_path: Path to main video file
+        main_probe: Probe of the main video
+        broll_paths: Paths to normalized B-roll files
+        broll_timings: List of (start, end) tuples, in input order
+        output_path: Path for output video
+
+    Returns:
+        CompletedProcess of the final concat run
+
+    Raises:
+        subprocess.CalledProcessError: If FFmpeg fails
+    """
+    work_dir = tempfile.mkdtemp(prefix="broll_splice_")
+    try:
+        frame_rate = main_probe.constant_frame_rate
+        min_gap = 1 / float(Fraction(frame_rate))
+        entries = []
+        gap_jobs = []
+        cursor = 0.0
+
+        order = sorted(range(len(broll_paths)), key=lambda i: broll_timings[i][0])
+        for i in order + [None]:
+            start_time = main_probe.duration if i is None else broll_timings[i][0]
+            # Skip slivers shorter than a frame between adjacent B-rolls
+            if start_time - cursor >= min_gap:
+                gap_path = os.path.join(work_dir, f"main_{len(gap_jobs)}.mp4")
+                gap_end = None if i is None else start_time
+                gap_jobs.append(
+                    _encode_main_segment(main_video_path, cursor, gap_end, frame_rate, gap_path)
+                )
+                entry = f"file '{_concat_escape(gap_path)}'\n"
+                if gap_end is not None:
+                    # The encode rounds the gap up to a whole frame; cap it at
+                    # the window edge so later segments don't drift from the audio
+                    entry += f"outpoint {gap_end - cursor}\n"
+                entries.append(entry)
+            if i is not None:
+                start_time, end_time = broll_timings[i]
+                entries.append(f"file '{_concat_escape(broll_paths[i])}'\noutpoint {end_time - start_time}\n")
+                cursor = end_time
+
+        # Let every job finish before the work dir is removed, then surface
+        # the first failure
+        for outcome in await asyncio.gather(*gap_jobs, return_exceptions=True):
+            if isinstance(outcome, BaseException):
+                raise outcome
+
+        concat_list_path = os.path.join(work_dir, "concat_list.txt")
+        with open(concat_list_path, "w") as f:
+            f.writelines(entries)
+
+        cmd = [
+            "ffmpeg", "-y",
+            "-fflags", "+genpts",
+            "-f", "concat",
+            "-safe", "0",
+            "-i", concat_list_path,
+            "-i", main_video_path,
+            "-map", "0:v",
+            "-map", "1:a",
+            "-c:v", "copy",
+            *_MEM_FLAGS,
+            "-c:a", "aac",
+            "-b:a", "192k",
+            "-shortest",
+            *_mp4_output_args(output_path),
+            output_path
+        ]
+
+        logger.info(f"Full command: {' '.join(cmd)}")
+        return await ffmpeg_pool.run(cmd)
+
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+async def _overlay_brolls(
+    main_video_path: str,
+    broll_paths: List[str],
+    broll_timings: List[Tuple[float, float]],
+    output_path: str
+) -> subprocess.CompletedProcess:
+    """
+    Overlay normalized B-rolls on the main video in one filter graph
+
+    Args:
+        main_video_path: Path to main video file
+        broll_paths: Paths to normalized B-roll files
+        broll_timings: List of (start, end) tuples, in input order
+        output_path: Path for output video
+
+    Returns:
+        CompletedProcess of the FFmpeg run
+
+    Raises:
+        subprocess.CalledProcessError: If FFmpeg fails
+    """
+    input_args, encoder_args = await _video_encoder_args()
+
+    cmd = [
+        "ffmpeg", "-y",
+        "-filter_complex_threads", str(os.cpu_count() or 1),
+        *input_args,
+        "-fflags", "+genpts",
+        "-i", main_video_path
+    ]
+
+    for broll_path in broll_paths:
+        cmd.extend(["-i", broll_path])
+
+    filter_parts = []
+
+    for i in range(len(broll_paths)):
+        filter_parts.append(f"[{i+1}:v]setpts=PTS-STARTPTS[vb{i+1}]")
+
+    if _timings_are_disjoint(broll_timings):
+        filter_parts.extend(_segmented_overlay_filters(broll_timings))
+    else:
+        logger.info("B-roll timings overlap, using a chained overlay graph")
+        filter_parts.extend(_chained_overlay_filters(broll_timings))
+
+    filter_parts.append("[0:a]acopy[outa]")
+
+    filter_complex = ";\n".join(filter_parts)
+
+    cmd.extend([
+        "-filter_complex", filter_complex,
+        "-map", "[outv]",
+        "-map", "[outa]",
+        *encoder_args,
+        *_MEM_FLAGS,
+        "-c:a", "aac",
+        "-b:a", "192k",
+        "-shortest",
+        *_mp4_output_args(output_path),
+        output_path
+    ])
+
+    logger.info("=" * 60)
+    logger.info("FFmpeg Command:")
+    logger.info(" ".join(cmd))
+    logger.info("=" * 60)
+    logger.info("Filter Complex:")
+    logger.info(filter_complex)
+    logger.info("=" * 60)
+
+    logger.info("Running FFmpeg...")
+    return await ffmpeg_pool.run(cmd)
+
+
+async def insert_brolls_ffmpeg(
     main_video_path: str,
     broll_paths: List[str],
     broll_timings: List[Tuple[float, float]],
@@ -400,6 +1556,10 @@ def insert_brolls_ffmpeg(
     """
     Overlay B-roll clips on top of main video at specified timestamps using FFmpeg
 
+    When the B-rolls fully replace stretches of the main video they are cut
+    in with the concat demuxer instead, which only re-encodes the stretches
+    in between.
+
     Args:
         main_video_path: Path to main video file
         broll_paths: List of paths to B-roll video files
@@ -418,64 +1578,29 @@ def insert_brolls_ffmpeg(
                 f"Number of B-rolls ({len(broll_paths)}) must match number of timings ({len(broll_timings)})"
             )
 
-        cmd = ["ffmpeg", "-y", "-i", main_video_path]
-
-        for broll_path in broll_paths:
-            cmd.extend(["-i", broll_path])
+        main_probe = (await probe_many([main_video_path]))[0]
+        # Only force the main video's rate on the B-rolls when it is
+        # constant; a variable-rate stream's r_frame_rate can be 1000/1
+        frame_rate = main_probe.constant_frame_rate if main_probe else None
 
-        filter_parts = []
-
-        for i in range(len(broll_paths)):
-            start_time, end_time = broll_timings[i]
-            duration = end_time - start_time
-
-            filter_parts.append(
-                f"[{i+1}:v]scale=1080:1920:force_original_aspect_ratio=increase,"
-                f"crop=1080:1920,setpts=PTS-STARTPTS+{start_time}/TB[vb{i+1}]"
-            )
-
-        current_label = "[0:v]"
+        normalized_paths = await asyncio.gather(
+            *(_normalize_broll(p, frame_rate=frame_rate) for p in broll_paths)
+        )
+        broll_probes = await probe_many(normalized_paths)
 
-        for i in range(len(broll_paths)):
+        for i, probe in enumerate(broll_probes):
             start_time, end_time = broll_timings[i]
-
-            if i == len(broll_paths) - 1:
-                filter_parts.append(
-                    f"{current_label}[vb{i+1}]overlay=enable='between(t,{start_time},{end_time})'[outv]"
+            if probe and probe.duration is not None and probe.duration < end_time - start_time:
+                logger.warning(
+                    f"B-roll {i+1} is {probe.duration:.2f}s but its window is "
+                    f"{end_time - start_time:.2f}s; its last frame will be held"
                 )
-            else:
-                filter_parts.append(
-                    f"{current_label}[vb{i+1}]overlay=enable='between(t,{start_time},{end_time})'[v{i+1}]"
-                )
-                current_label = f"[v{i+1}]"
-
-        filter_parts.append("[0:a]acopy[outa]")
-
-        filter_complex = ";\n".join(filter_parts)
 
-        cmd.extend([
-            "-filter_complex", filter_complex,
-            "-map", "[outv]",
-            "-map", "[outa]",
-            "-c:v", "libx264",
-            "-preset", "ultrafast",
-            "-crf", "23",
-            "-c:a", "aac",
-            "-b:a", "192k",
-            "-shortest",
-            output_path
-        ])
-
-        logger.info("=" * 60)
-        logger.info("FFmpeg Command:")
-        logger.info(" ".join(cmd))
-        logger.info("=" * 60)
-        logger.info("Filter Complex:")
-        logger.info(filter_complex)
-        logger.info("=" * 60)
-
-        logger.info("Running FFmpeg...")
-        result = subprocess.run(cmd, capture_output=True, text=True, check=True)
+        if _can_splice_brolls(main_probe, broll_probes, broll_timings):
+            logger.info("B-rolls fully cover their windows, splicing with the concat demuxer")
+            await _splice_brolls(main_video_path, main_probe, normalized_paths, broll_timings, output_path)
+        else:
+            await _overlay_brolls(main_video_path, normalized_paths, broll_timings, output_path)
 
         logger.info(f"B-rolls overlaid successfully: {output_path}")
 
@@ -484,5 +1609,5 @@ def insert_brolls_ffmpeg(
             logger.info(f"Output file size: {output_size:.2f}MB")
 
     except subprocess.CalledProcessError as e:
-        logger.error(f"FFmpeg error: {e.stderr}")
+        logger.error(f"FFmpeg error: {_decode_tail(e.stderr, _STDERR_TAIL_BYTES)}")
         raise
@@ -25,6 +25,9 @@ logger = logging.getLogger(__name__)
 _whisper_model_cache: Optional[object] = None
 _whisper_model_size: Optional[str] = None
 
+# Transcripts longer than this are converted to SRT off the event loop
+_LONG_TRANSCRIPT_SEGMENTS = 1024
+
 
 def _load_whisper_model(model_size: str = "tiny"):
     """Load and cache Whisper model"""
@@ -109,7 +112,11 @@ async def process_caption_task(task_id: UUID, task_data: Dict[str, Any]) -> None
             logger.info(f"[{task_id}] First subtitle: {subtitles[0].get('text', 'N/A')[:100]}...")
 
         logger.info(f"[{task_id}] Generating SRT subtitles")
-        srt_text = write_srt(subtitles, max_words_per_line=3)
+        if len(subtitles) > _LONG_TRANSCRIPT_SEGMENTS:
+            # Keep the event loop free to drive other tasks' FFmpeg jobs
+            srt_text = await asyncio.to_thread(write_srt, subtitles, max_words_per_line=3)
+        else:
+            srt_text = write_srt(subtitles, max_words_per_line=3)
         logger.info(f"[{task_id}] SRT generation complete, length: {len(srt_text)} chars")
         logger.info(f"[{task_id}] SRT preview: {srt_text[:200]}...")
 
@@ -118,8 +125,7 @@ async def process_caption_task(task_id: UUID, task_data: Dict[str, Any]) -> None
 
         logger.info(f"[{task_id}] Burning subtitles into video using FFmpeg")
         logger.info(f"[{task_id}] Input: {video_path}, Output: {output_path}")
-        with ThreadPoolExecutor() as burn_executor:
-            await loop.run_in_executor(burn_executor, burn_subtitles, video_path, srt_text, output_path)
+        await burn_subtitles(video_path, srt_text, output_path)
         logger.info(f"[{task_id}] Subtitle burning complete")
 
         if os.path.exists(output_path):
@@ -204,21 +210,17 @@ async def process_merge_task(task_id: UUID, task_data: Dict[str, Any]) -> None:
             scene_output = os.path.join(temp_dir, f"scene_{i}_final.mp4")
 
             logger.info(f"[{task_id}] Merging scene {i+1} video and audio with FFmpeg")
-            loop = asyncio.get_event_loop()
-            with ThreadPoolExecutor() as executor:
-                await loop.run_in_executor(
-                    executor,
-                    merge_video_audio,
-                    scene_path,
-                    voice_path,
-                    scene_output,
-                    video_volume,
-                    voiceover_volume,
-                    5.0,
-                    width,
-                    height,
-                    "cover"
-                )
+            await merge_video_audio(
+                scene_path,
+                voice_path,
+                scene_output,
+                video_volume,
+                voiceover_volume,
+                5.0,
+                width,
+                height,
+                "cover"
+            )
             logger.info(f"[{task_id}] Scene {i+1} merge complete")
 
             scene_files.append(scene_output)
@@ -234,9 +236,7 @@ async def process_merge_task(task_id: UUID, task_data: Dict[str, Any]) -> None:
         output_path = os.path.join(settings.video_output_dir, output_filename)
 
         logger.info(f"[{task_id}] Concatenating all scenes with FFmpeg")
-        loop = asyncio.get_event_loop()
-        with ThreadPoolExecutor() as executor:
-            await loop.run_in_executor(executor, concat_videos, concat_list_path, output_path)
+        await concat_videos(concat_list_path, output_path)
         logger.info(f"[{task_id}] Concatenation complete")
 
         result_url = f"{settings.railway_public_url}/video/{output_filename}"
@@ -311,17 +311,13 @@ async def process_background_music_task(task_id: UUID, task_data: Dict[str, Any]
         output_path = os.path.join(settings.video_output_dir, output_filename)
 
         logger.info(f"[{task_id}] Adding background music to video with FFmpeg")
-        loop = asyncio.get_event_loop()
-        with ThreadPoolExecutor() as executor:
-            await loop.run_in_executor(
-                executor,
-                add_background_music,
-                video_path,
-                music_path,
-                output_path,
-                music_volume,
-                video_volume
-            )
+        await add_background_music(
+            video_path,
+            music_path,
+            output_path,
+            music_volume,
+            video_volume
+        )
         logger.info(f"[{task_id}] Background music addition complete")
 
         result_url = f"{settings.railway_public_url}/video/{output_filename}"
@@ -411,16 +407,12 @@ async def process_merge_broll_task(task_id: UUID, task_data: Dict[str, Any]) ->
         output_path = os.path.join(settings.video_output_dir, output_filename)
 
         logger.info(f"[{task_id}] Merging B-rolls into main video with FFmpeg")
-        loop = asyncio.get_event_loop()
-        with ThreadPoolExecutor() as executor:
-            await loop.run_in_executor(
-                executor,
-                insert_brolls_ffmpeg,
-                main_video_path,
-                broll_paths,
-                broll_timings_tuples,
-                output_path
-            )
+        await insert_brolls_ffmpeg(
+            main_video_path,
+            broll_paths,
+            broll_timings_tuples,
+            output_path
+        )
         logger.info(f"[{task_id}] B-roll merge complete")
 
         if os.path.exists(output_path):